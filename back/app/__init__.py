@@ -0,0 +1,8 @@
+import os
+
+# OpenMP / MKL 설정은 torch 가 import 되기 전에 정해져야 적용되므로
+# app 패키지가 처음 import 될 때 기본값을 둔다 (환경 변수로 덮어쓸 수 있음).
+# 코어 하나는 이벤트 루프/요청 처리용으로 남긴다.
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) - 1)))
+os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+os.environ.setdefault("MKL_DYNAMIC", "FALSE")
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .config import settings
+from .model import classify_batch
+from .worker import run_inference
+
+
+_Item = Tuple[str, "asyncio.Future[Dict[str, object]]"]
+
+
+class DecisionCache:
+    """정규화한 입력의 해시를 키로 최근 분류 결과를 보관하는 LRU 캐시.
+
+    원문 대신 해시만 저장하므로 메모리에 사용자 문장이 남지 않는다.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, Dict[str, object]] = OrderedDict()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        normalized = text.strip().lower()
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, object]]:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: bytes, result: Dict[str, object]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class ClassifyBatcher:
+    """짧은 시간 안에 들어온 분류 요청을 모아 한 번의 forward 로 처리."""
+
+    def __init__(
+        self, max_batch_size: int, timeout_ms: float, cache_size: int = 0
+    ) -> None:
+        self.max_batch_size = max(1, max_batch_size)
+        self.timeout = max(0.0, timeout_ms) / 1000.0
+        self.cache = DecisionCache(cache_size)
+        self._queue: Optional[asyncio.Queue[_Item]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        # 큐에서 꺼냈지만 아직 결과를 받지 못한 요청 (모으는 중이거나 추론 중)
+        self._pending: List[_Item] = []
+
+    def _ensure_started(self) -> asyncio.Queue[_Item]:
+        if self._queue is None or self._task is None or self._task.done():
+            # 죽은 작업에 남아 있던 요청은 영원히 기다리지 않도록 실패 처리
+            self._fail_pending(RuntimeError("Classifier batcher stopped unexpectedly."))
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, text: str) -> Dict[str, object]:
+        """문장 하나를 큐에 넣고 배치 분류 결과를 기다린다.
+
+        같은 (정규화된) 문장을 최근에 분류했다면 모델을 거치지 않고 돌려준다.
+        """
+        key = self.cache.key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        queue = self._ensure_started()
+        future: asyncio.Future[Dict[str, object]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        await queue.put((text, future))
+        result = await future
+        self.cache.put(key, dict(result))
+        return result
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._fail_pending(RuntimeError("Classifier batcher is shutting down."))
+        self._task = None
+        self._queue = None
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        """큐에 남았거나 처리 중이던 요청의 future 를 exc 로 끝낸다."""
+        items = self._pending
+        self._pending = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+        for _, future in items:
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _collect(self, queue: asyncio.Queue[_Item]) -> List[_Item]:
+        """첫 요청이 온 뒤 timeout 동안 최대 max_batch_size 개까지 모은다."""
+        loop = asyncio.get_running_loop()
+        batch = self._pending = [await queue.get()]
+        deadline = loop.time() + self.timeout
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # 이미 떠난 클라이언트의 요청은 모델에 넣지 않는다
+        self._pending = [item for item in batch if not item[1].cancelled()]
+        return self._pending
+
+    async def _run(self, queue: asyncio.Queue[_Item]) -> None:
+        while True:
+            batch = await self._collect(queue)
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+            try:
+                results = await run_inference(classify_batch, texts)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                self._pending = []
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._pending = []
+
+
+batcher = ClassifyBatcher(
+    settings.batch_max_size,
+    settings.batch_timeout_ms,
+    cache_size=settings.decision_cache_size,
+)
@@ -1,7 +1,9 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -11,6 +13,8 @@ MODELS_DIR = BASE_DIR / "models"
 class Settings(BaseSettings):
     """Application configuration."""
 
+    model_config = SettingsConfigDict(env_file=".env", frozen=True)
+
     # Mistral-7B v0.2 기본 모델이 들어 있는 폴더 (models/base)
     base_model_path: str = Field(
         default=str(MODELS_DIR / "base"),
@@ -23,25 +27,82 @@ class Settings(BaseSettings):
         description="Path to LoRA/adapter directory.",
     )
 
+    # distill 된 작은 SAFE/UNSAFE 분류기(ONNX)가 들어 있는 폴더 (models/student)
+    student_model_path: str = Field(
+        default=str(MODELS_DIR / "student"),
+        description="Path to the distilled ONNX SAFE/UNSAFE classifier (optional).",
+    )
+
+    student_confidence_threshold: float = Field(
+        default=0.9,
+        description="Minimum student softmax probability; below this Mistral decides.",
+    )
+
+    # scripts/export_onnx.py 로 만든 INT8 ONNX 모델 폴더 (models/onnx)
+    onnx_model_path: str = Field(
+        default=str(MODELS_DIR / "onnx"),
+        description="Path to the exported ONNX Runtime model (cpu_backend='onnx').",
+    )
+
+    # scripts/export_gguf.py 로 만든 llama.cpp 용 GGUF 파일
+    gguf_model_path: str = Field(
+        default=str(MODELS_DIR / "mistral-filter-q4_k_m.gguf"),
+        description="Path to the Q4_K_M GGUF model (cpu_backend='llama').",
+    )
+
+    cpu_backend: str = Field(
+        default="auto",
+        description=(
+            "Inference backend when running on CPU: 'llama', 'onnx', 'torch' or 'auto' "
+            "(llama.cpp if the GGUF file exists, then ONNX, then PyTorch)."
+        ),
+    )
+
     device: str = Field(
         default="cpu",
         description="Target device for model execution. e.g. 'cpu', 'cuda', 'cuda:0'",
     )
 
+    quantization: str = Field(
+        default="4bit",
+        description="bitsandbytes weight quantization on CUDA: '4bit' (NF4), '8bit' or 'none'.",
+    )
+
+    compile_model: Optional[bool] = Field(
+        default=None,
+        description=(
+            "Wrap the loaded model with torch.compile(mode='reduce-overhead'). "
+            "Unset means on for CUDA, off for CPU."
+        ),
+    )
+
     max_tokens: int = Field(
         default=256,
         description="Maximum tokens for prompt length.",
     )
 
+    batch_max_size: int = Field(
+        default=8,
+        description="Maximum number of requests coalesced into one classifier forward pass.",
+    )
+
+    batch_timeout_ms: float = Field(
+        default=10.0,
+        description="How long the batcher waits for more requests before running a batch.",
+    )
+
+    decision_cache_size: int = Field(
+        default=4096,
+        description="Number of recent classifier decisions kept in memory (0 disables the cache).",
+    )
+
     temperature: float = Field(
         default=0.7,
         description="Sampling temperature for generation (if used).",
     )
 
-    class Config:
-        env_file = ".env"
-
 
+@lru_cache(maxsize=1)
 def get_settings() -> "Settings":
     return Settings()
 
@@ -3,15 +3,14 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routes import chat
-
+from .batcher import batcher
 from .config import settings
+from .model import warmup
 from .routes.chat import router as chat_router
+from .worker import run_inference, shutdown as shutdown_worker
 
 app = FastAPI(title="Filter Waifu Backend", version="0.1.0")
 
-app = FastAPI()
-
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -21,6 +20,18 @@ app.add_middleware(
     allow_headers=["*"],      # Content-Type 등 모든 헤더 허용
 )
 
+@app.on_event("startup")
+async def _warmup() -> None:
+    # 컴파일/첫 실행은 실제 추론과 같은 워커 스레드에서 미리 수행
+    await run_inference(warmup)
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    await batcher.stop()
+    shutdown_worker()
+
+
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
@@ -29,7 +40,7 @@ async def health() -> dict[str, str]:
 @app.get("/config")
 async def config() -> dict[str, str | int | float]:
     return {
-        "model_path": settings.model_path,
+        "model_path": settings.base_model_path,
         "device": settings.device,
         "max_tokens": settings.max_tokens,
         "temperature": settings.temperature,
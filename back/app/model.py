@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import logging
+import os
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
 
 from .config import settings
 
@@ -13,10 +17,58 @@ try:
 except ImportError:
     PeftModel = None  # type: ignore[assignment]
 
+try:
+    import flash_attn  # noqa: F401
+except ImportError:
+    flash_attn = None  # type: ignore[assignment]
+
+try:
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTModelForSequenceClassification
+except ImportError:
+    ORTModelForCausalLM = None  # type: ignore[assignment]
+    ORTModelForSequenceClassification = None  # type: ignore[assignment]
+
+try:
+    import llama_cpp
+    from llama_cpp import Llama
+except ImportError:
+    llama_cpp = None  # type: ignore[assignment]
+    Llama = None  # type: ignore[assignment]
+
+try:
+    import bitsandbytes  # noqa: F401
+except ImportError:
+    bitsandbytes = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
 
 _TOKENIZER = None
 _MODEL = None
 _DEVICE = None
+_LOAD_ERROR: Optional[BaseException] = None
+_STUDENT = None
+_LABEL_IDS: Optional[Tuple[torch.Tensor, torch.Tensor]] = None
+_PROMPT_IDS: Optional[Tuple[List[int], List[int]]] = None
+
+# 컴파일된 모델 입력 길이를 맞추는 단위 (토큰)
+_SEQ_BUCKET = 64
+
+# 판단 라벨로 인정하는 단어들 (각 단어의 첫 토큰만 사용)
+_LABEL_KEYWORDS = {
+    "safe": ["SAFE", "OK"],
+    "unsafe": ["UNSAFE", "NOT", "BAD"],
+}
+
+# 판단별 응답 dict (요청마다 문자열 분기 없이 복사만 한다)
+_RESULTS: Dict[bool, Dict[str, object]] = {
+    is_safe: {
+        "is_safe": is_safe,
+        "raw_decision": label,
+        "normalized_decision": label,
+    }
+    for is_safe, label in ((True, "SAFE"), (False, "UNSAFE"))
+}
 
 
 def _get_device() -> torch.device:
@@ -46,28 +98,160 @@ def _adapter_dir() -> Path:
     return path
 
 
-def load_model() -> Tuple[AutoTokenizer, torch.nn.Module]:
-    """Mistral + (옵션) LoRA 어댑터를 로드하고 캐시."""
-    global _TOKENIZER, _MODEL
-    if _TOKENIZER is not None and _MODEL is not None:
-        return _TOKENIZER, _MODEL
+def _quantization_config(device: torch.device) -> Optional[BitsAndBytesConfig]:
+    """설정에 맞는 bitsandbytes 양자화 설정 (사용 불가하면 None).
 
-    base_dir = _base_model_dir()
-    device = _get_device()
+    bnb 커널은 CUDA 에서만 이득이 있으므로 CPU 에서는 양자화하지 않는다.
+    """
+    mode = settings.quantization.lower()
+    if mode == "none" or device.type != "cuda":
+        return None
+    if bitsandbytes is None:
+        logger.warning("bitsandbytes is not installed; ignoring quantization=%r.", mode)
+        return None
 
-    # ✅ 여기서 읽는 config.json 이 바로 Mistral-7B-v0.2 의 config 여야 함
-    tokenizer = AutoTokenizer.from_pretrained(base_dir, use_fast=True)
-    if tokenizer.pad_token is None:
-        tokenizer.pad_token = tokenizer.eos_token
+    if mode == "4bit":
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=torch.float16,
+            bnb_4bit_use_double_quant=True,
+        )
+    if mode == "8bit":
+        return BitsAndBytesConfig(load_in_8bit=True)
+    return None
+
+
+def _attn_implementation(device: torch.device) -> str:
+    """CUDA + flash-attn 이면 FlashAttention-2, 그 외에는 PyTorch SDPA."""
+    if device.type == "cuda" and flash_attn is not None:
+        return "flash_attention_2"
+    return "sdpa"
+
+
+def _has_safetensors(model_dir: Path) -> bool:
+    return any(model_dir.glob("*.safetensors"))
+
+
+def _load_base_model(base_dir: Path, device: torch.device) -> torch.nn.Module:
+    """베이스 모델 로드. 가능하면 bnb 양자화, 실패하면 fp16/fp32 로 로드.
+
+    safetensors 샤드가 있으면 mmap 으로 읽으므로 여러 Uvicorn 워커의 파일
+    읽기는 OS 페이지 캐시를 공유한다. 다만 dtype 변환/양자화로 새 텐서가
+    만들어지므로 메모리 상의 가중치는 워커마다 따로 가진다.
+    """
+    load_kwargs = {
+        "low_cpu_mem_usage": True,
+        "use_safetensors": True if _has_safetensors(base_dir) else None,
+        "attn_implementation": _attn_implementation(device),
+    }
+    quantization_config = _quantization_config(device)
+    if quantization_config is not None:
+        try:
+            return AutoModelForCausalLM.from_pretrained(
+                base_dir,
+                quantization_config=quantization_config,
+                device_map={"": str(device)},
+                **load_kwargs,
+            )
+        except Exception:
+            # 양자화 로드에 실패하면 기존 fp16/fp32 경로 사용
+            logger.warning(
+                "Quantized load failed; falling back to fp16/fp32 weights.",
+                exc_info=True,
+            )
 
     torch_dtype = torch.float16 if device.type == "cuda" else torch.float32
 
-    base_model = AutoModelForCausalLM.from_pretrained(
+    return AutoModelForCausalLM.from_pretrained(
         base_dir,
         torch_dtype=torch_dtype,
         device_map=None,
+        **load_kwargs,
     ).to(device)
 
+
+def _first_token_ids(tokenizer: AutoTokenizer, keywords: List[str]) -> Set[int]:
+    """각 키워드(앞 공백 유무 포함)의 첫 토큰 ID 집합."""
+    ids = set()
+    for keyword in keywords:
+        for variant in (keyword, f" {keyword}"):
+            token_ids = tokenizer(variant, add_special_tokens=False).input_ids
+            if token_ids:
+                ids.add(token_ids[0])
+    return ids
+
+
+def _label_ids(tokenizer: AutoTokenizer) -> Tuple[torch.Tensor, torch.Tensor]:
+    """SAFE / UNSAFE 라벨 토큰 ID 텐서를 한 번만 계산해 캐시."""
+    global _LABEL_IDS
+    if _LABEL_IDS is not None:
+        return _LABEL_IDS
+
+    safe = _first_token_ids(tokenizer, _LABEL_KEYWORDS["safe"])
+    unsafe = _first_token_ids(tokenizer, _LABEL_KEYWORDS["unsafe"])
+    # 양쪽에 모두 나오는 토큰(예: 단독 '▁')은 판별력이 없으므로 제외
+    shared = safe & unsafe
+    safe -= shared
+    unsafe -= shared
+    if not safe or not unsafe:
+        raise RuntimeError("Could not resolve SAFE/UNSAFE label token ids.")
+
+    device = _get_device()
+    _LABEL_IDS = (
+        torch.tensor(sorted(safe), device=device),
+        torch.tensor(sorted(unsafe), device=device),
+    )
+    return _LABEL_IDS
+
+
+def load_model() -> Tuple[AutoTokenizer, torch.nn.Module]:
+    """Mistral + (옵션) LoRA 어댑터를 로드하고 캐시.
+
+    서버 시작 시 한 번 호출된다. 시작 시 로드에 실패했다면 다시 시도하지 않고
+    같은 오류를 알린다.
+    """
+    global _LOAD_ERROR
+    if _TOKENIZER is not None and _MODEL is not None:
+        return _TOKENIZER, _MODEL
+    if _LOAD_ERROR is not None:
+        raise RuntimeError("Model initialisation failed at startup.") from _LOAD_ERROR
+
+    try:
+        return _load_model()
+    except Exception as exc:
+        _LOAD_ERROR = exc
+        raise
+
+
+def _loaded_model() -> Tuple[AutoTokenizer, torch.nn.Module]:
+    """이미 로드된 토크나이저/모델 반환 (요청 경로에서는 로드하지 않음)."""
+    if _TOKENIZER is None or _MODEL is None:
+        raise RuntimeError("Model is not loaded; load_model() must run at startup.")
+    return _TOKENIZER, _MODEL
+
+
+def _load_student() -> None:
+    """distill 된 작은 SAFE/UNSAFE 분류기(ONNX)가 있으면 로드."""
+    global _STUDENT
+    path = Path(settings.student_model_path)
+    if ORTModelForSequenceClassification is None or not path.exists():
+        return
+
+    quantized = path / "model_quantized.onnx"
+    tokenizer = AutoTokenizer.from_pretrained(path, use_fast=True)
+    model = ORTModelForSequenceClassification.from_pretrained(
+        path,
+        file_name=quantized.name if quantized.exists() else None,
+        provider="CPUExecutionProvider",
+    )
+    _STUDENT = (tokenizer, model)
+
+
+def _load_torch_model(base_dir: Path, device: torch.device) -> torch.nn.Module:
+    """PyTorch 경로: 베이스 모델 + LoRA 어댑터 (합친 뒤 컴파일)."""
+    base_model = _load_base_model(base_dir, device)
+
     model = base_model
     if PeftModel is not None:
         try:
@@ -76,65 +260,402 @@ def load_model() -> Tuple[AutoTokenizer, torch.nn.Module]:
         except Exception:
             # 어댑터 로드에 실패하면 베이스 모델만 사용
             model = base_model
+        else:
+            quantized = getattr(base_model, "is_loaded_in_4bit", False) or getattr(
+                base_model, "is_loaded_in_8bit", False
+            )
+            # bnb 양자화 베이스에 합치면 재양자화로 작은 LoRA 변화량이 뭉개지므로
+            # fp16/fp32 베이스에만 합친다
+            if not quantized:
+                try:
+                    # LoRA 가중치를 베이스 linear 에 합쳐 forward 마다 추가 matmul 제거
+                    model = model.merge_and_unload()
+                except Exception:
+                    # 합치기에 실패하면 어댑터를 붙인 채로 사용
+                    logger.warning("LoRA merge failed; keeping adapter unmerged.", exc_info=True)
 
     model.eval()
+    compile_model = settings.compile_model
+    if compile_model is None:
+        compile_model = device.type == "cuda"
+    if compile_model:
+        # 입력 shape 은 _encode_batch 의 bucket 으로 고정되므로 정적 shape 으로 컴파일
+        model = torch.compile(
+            model, mode="reduce-overhead", fullgraph=False, dynamic=False
+        )
+
+    return model
+
+
+class _OrtCausalLM:
+    """ORTModelForCausalLM 을 torch 모델처럼 한 번의 forward 로 호출하는 얇은 래퍼."""
+
+    def __init__(self, model: "ORTModelForCausalLM") -> None:
+        self.model = model
+
+    def __call__(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor,
+        position_ids: Optional[torch.Tensor] = None,
+        **_: object,
+    ) -> object:
+        return self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+        )
+
+
+def _load_onnx_model() -> _OrtCausalLM:
+    """CPU 경로: scripts/export_onnx.py 로 만든 INT8 ONNX 모델을 ORT 로 로드."""
+    if ORTModelForCausalLM is None:
+        raise RuntimeError("cpu_backend='onnx' requires optimum[onnxruntime].")
+    path = Path(settings.onnx_model_path)
+    if not path.exists():
+        raise RuntimeError(f"ONNX model path does not exist: {path}")
+
+    quantized = path / "model_quantized.onnx"
+    model = ORTModelForCausalLM.from_pretrained(
+        path,
+        file_name=quantized.name if quantized.exists() else None,
+        use_cache=False,
+        use_io_binding=False,
+        provider="CPUExecutionProvider",
+    )
+    return _OrtCausalLM(model)
+
+
+class _LlamaCppCausalLM:
+    """llama.cpp 모델을 torch 모델처럼 호출하는 얇은 래퍼.
+
+    GGUF 는 HF 토크나이저와 같은 vocab 을 쓰므로, 이미 토큰화된 ID 를 그대로
+    평가하고 마지막 위치 logits 만 돌려준다. 배치는 행 단위로 처리하며, KV
+    캐시에 이미 있는 공통 prefix (고정 지시문) 까지 되감고 나머지만 평가한다.
+    """
+
+    def __init__(self, llm: "Llama") -> None:
+        self.llm = llm
+
+    def _last_logits(self, ids: List[int]) -> torch.Tensor:
+        llm = self.llm
+        cached = llm.input_ids[: llm.n_tokens].tolist()
+        common = 0
+        for cached_id, token_id in zip(cached, ids):
+            if cached_id != token_id:
+                break
+            common += 1
+        # logits 를 얻으려면 최소 한 토큰은 평가해야 한다
+        common = min(common, len(ids) - 1)
+
+        # eval() 은 n_tokens 이후의 KV 캐시를 지우고 그 위치부터 이어서 평가한다
+        llm.n_tokens = common
+        llm.eval(ids[common:])
+
+        # logits_all=False 이면 scores 는 채워지지 않으므로 컨텍스트에서 직접 읽는다
+        logits = llama_cpp.llama_get_logits_ith(llm.ctx, -1)
+        return torch.from_numpy(
+            np.ctypeslib.as_array(logits, shape=(llm.n_vocab(),)).copy()
+        )
+
+    def __call__(
+        self, input_ids: torch.Tensor, attention_mask: torch.Tensor, **_: object
+    ) -> SimpleNamespace:
+        rows = [
+            self._last_logits(ids[mask.bool()].tolist())
+            for ids, mask in zip(input_ids, attention_mask)
+        ]
+        return SimpleNamespace(logits=torch.stack(rows).unsqueeze(1))
+
+
+def _load_llama_model() -> _LlamaCppCausalLM:
+    """CPU 경로: scripts/export_gguf.py 로 만든 Q4_K_M GGUF 를 llama.cpp 로 로드."""
+    if Llama is None:
+        raise RuntimeError("cpu_backend='llama' requires llama-cpp-python.")
+    path = Path(settings.gguf_model_path)
+    if not path.exists():
+        raise RuntimeError(f"GGUF model path does not exist: {path}")
+
+    llm = Llama(
+        model_path=str(path),
+        n_ctx=max(512, settings.max_tokens),
+        n_batch=512,
+        n_threads=int(os.environ.get("OMP_NUM_THREADS", os.cpu_count() or 1)),
+        use_mmap=True,
+        logits_all=False,
+        verbose=False,
+    )
+    return _LlamaCppCausalLM(llm)
+
+
+def _cpu_backend() -> str:
+    """CPU 에서 사용할 추론 백엔드 결정 ('auto' 는 준비된 것 중 가장 빠른 것)."""
+    backend = settings.cpu_backend.lower()
+    if backend != "auto":
+        return backend
+    if Llama is not None and Path(settings.gguf_model_path).exists():
+        return "llama"
+    if ORTModelForCausalLM is not None and Path(settings.onnx_model_path).exists():
+        return "onnx"
+    return "torch"
+
+
+def _load_model() -> Tuple[AutoTokenizer, torch.nn.Module]:
+    global _TOKENIZER, _MODEL
+    base_dir = _base_model_dir()
+    device = _get_device()
+
+    # ✅ 여기서 읽는 config.json 이 바로 Mistral-7B-v0.2 의 config 여야 함
+    tokenizer = AutoTokenizer.from_pretrained(base_dir, use_fast=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    # 배치 분류 시 마지막 위치가 다음 토큰이 되도록 왼쪽 패딩
+    tokenizer.padding_side = "left"
+
+    backend = _cpu_backend() if device.type == "cpu" else "torch"
+    if backend == "llama":
+        model = _load_llama_model()
+    elif backend == "onnx":
+        model = _load_onnx_model()
+    else:
+        model = _load_torch_model(base_dir, device)
+
+    try:
+        _load_student()
+    except Exception:
+        # student 로드에 실패하면 Mistral 만 사용
+        logger.warning("Student classifier failed to load; using Mistral only.", exc_info=True)
+
     _TOKENIZER = tokenizer
     _MODEL = model
     return _TOKENIZER, _MODEL
 
 
-def classify_text(text: str) -> Dict[str, object]:
-    """입력 문장을 SAFE / UNSAFE 로 분류."""
-    tokenizer, model = load_model()
-    device = _get_device()
+_PROMPT_PREFIX = (
+    "다음 사용자의 발화가 부적절한 표현인지 판별하십시오. "
+    "부적절한 경우에는 'UNSAFE', 문제가 없으면 'SAFE' 라는 단어 하나만 출력하세요.\n\n"
+    "사용자:"
+)
+_PROMPT_SUFFIX = "\n판단:"
+
+
+def _continuation_ids(tokenizer: AutoTokenizer, text: str) -> List[int]:
+    """text 를 다른 문장 뒤에 이어 붙였을 때의 토큰 ID.
+
+    SentencePiece 토크나이저는 단독으로 토큰화할 때 앞에 '▁' 를 붙이므로,
+    앞 문맥과 함께 토큰화한 뒤 문맥 부분을 잘라낸다.
+    """
+    anchor = tokenizer("가", add_special_tokens=False).input_ids
+    joined = tokenizer("가" + text, add_special_tokens=False).input_ids
+    if joined[: len(anchor)] == anchor:
+        return joined[len(anchor):]
+    return tokenizer(text, add_special_tokens=False).input_ids
+
+
+def _prompt_ids(tokenizer: AutoTokenizer) -> Tuple[List[int], List[int]]:
+    """고정 지시문(prefix)과 '판단:'(suffix) 토큰 ID 를 한 번만 계산해 캐시."""
+    global _PROMPT_IDS
+    if _PROMPT_IDS is None:
+        prefix = tokenizer(_PROMPT_PREFIX).input_ids
+        suffix = _continuation_ids(tokenizer, _PROMPT_SUFFIX)
+        _PROMPT_IDS = (prefix, suffix)
+    return _PROMPT_IDS
+
+
+def _is_compiled(model: object) -> bool:
+    return hasattr(model, "_orig_mod")
+
+
+def _use_eager_model() -> torch.nn.Module:
+    """torch.compile 된 모델을 원래(eager) 모델로 되돌린다."""
+    global _MODEL
+    _MODEL = _MODEL._orig_mod
+    return _MODEL
+
+
+def _batch_bucket(size: int) -> int:
+    """컴파일된 모델용 배치 크기 bucket (2 의 거듭제곱)."""
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return bucket
+
+
+def _encode_batch(
+    tokenizer: AutoTokenizer, texts: List[str], bucketed: bool = False
+) -> Dict[str, torch.Tensor]:
+    """캐시된 prefix/suffix 사이에 사용자 문장 토큰만 끼워 배치를 만든다.
 
-    instruction = (
-        "다음 사용자의 발화가 부적절한 표현인지 판별하십시오. "
-        "부적절한 경우에는 'UNSAFE', 문제가 없으면 'SAFE' 라는 단어 하나만 출력하세요.\n\n"
-        f"사용자: {text}\n"
-        "판단:"
+    사용자 문장은 prefix/suffix 를 뺀 길이만큼만 잘라 '판단:' 이 항상 남는다.
+    bucketed 이면 (컴파일된 모델용) 행 수는 2 의 거듭제곱으로, 길이는
+    _SEQ_BUCKET 의 배수로 채워 재컴파일 없이 미리 warmup 한 shape 만 쓰게 한다.
+    추가된 행은 첫 행의 복사본이며 결과에서 버린다.
+    """
+    prefix, suffix = _prompt_ids(tokenizer)
+    budget = max(1, settings.max_tokens - len(prefix) - len(suffix))
+
+    # 앞의 '사용자:' 뒤 공백은 토크나이저가 붙이는 '▁' 로 표현된다
+    user_ids = tokenizer(
+        texts,
+        add_special_tokens=False,
+        truncation=True,
+        max_length=budget,
+    ).input_ids
+
+    rows = [prefix + ids + suffix for ids in user_ids]
+    if bucketed:
+        rows += [rows[0]] * (_batch_bucket(len(rows)) - len(rows))
+
+    return tokenizer.pad(
+        {"input_ids": rows},
+        padding=True,
+        pad_to_multiple_of=_SEQ_BUCKET if bucketed else None,
+        return_tensors="pt",
     )
 
+
+def _last_logits(model: torch.nn.Module, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+    """한 번의 forward 로 각 행의 다음 토큰 logits 만 구한다."""
+    # 왼쪽 패딩이라도 실제 토큰 위치가 0 부터 시작하도록 position_ids 지정
+    position_ids = (inputs["attention_mask"].cumsum(-1) - 1).clamp(min=0)
+
+    with torch.inference_mode():
+        # 다음 토큰 하나만 보므로 KV 캐시를 만들지 않고, lm_head 도 마지막
+        # 위치에서만 계산한다 (vocab x seq_len matmul 절약)
+        return model(
+            **inputs,
+            position_ids=position_ids,
+            use_cache=False,
+            logits_to_keep=1,
+        ).logits[:, -1]
+
+
+def _classify_with_llm(texts: List[str]) -> List[bool]:
+    """Mistral 한 번의 forward 로 각 문장의 SAFE 여부 판별.
+
+    generate() 로 여러 토큰을 디코딩하는 대신, 다음 토큰 logits 만 구해
+    SAFE / UNSAFE 라벨 토큰 점수를 비교한다. 패딩은 왼쪽에 두므로 각 행의
+    마지막 위치가 곧 다음 토큰 위치다.
+    """
+    tokenizer, model = _loaded_model()
+    safe_ids, unsafe_ids = _label_ids(tokenizer)
+    device = _get_device()
+
+    compiled = _is_compiled(model)
+    inputs = _encode_batch(tokenizer, texts, bucketed=compiled).to(device)
+    try:
+        logits = _last_logits(model, inputs)
+    except Exception:
+        if not compiled:
+            raise
+        logger.warning("Compiled forward failed; falling back to eager model.", exc_info=True)
+        logits = _last_logits(_use_eager_model(), inputs)
+    logits = logits[: len(texts)]
+
+    safe_scores = logits[:, safe_ids].max(dim=-1).values
+    unsafe_scores = logits[:, unsafe_ids].max(dim=-1).values
+    # 동점이면 보수적으로 unsafe 처리
+    return (safe_scores > unsafe_scores).tolist()
+
+
+def _classify_with_student(texts: List[str]) -> List[Optional[bool]]:
+    """작은 분류기로 판별. 확신도가 기준보다 낮은 문장은 None."""
+    if _STUDENT is None:
+        return [None] * len(texts)
+
+    tokenizer, model = _STUDENT
     inputs = tokenizer(
-        instruction,
+        texts,
         return_tensors="pt",
+        padding=True,
         truncation=True,
         max_length=settings.max_tokens,
-    ).to(device)
+    )
+    with torch.inference_mode():
+        probs = torch.softmax(model(**inputs).logits.float(), dim=-1)
 
-    with torch.no_grad():
-        output_ids = model.generate(
-            **inputs,
-            max_new_tokens=4,
-            do_sample=False,
-            temperature=0.0,
-            pad_token_id=tokenizer.eos_token_id,
-        )
+    safe_index = model.config.label2id.get("SAFE", 1)
+    confidence, predicted = probs.max(dim=-1)
+    return [
+        index == safe_index if score >= settings.student_confidence_threshold else None
+        for score, index in zip(confidence.tolist(), predicted.tolist())
+    ]
 
-    generated_ids = output_ids[0][inputs["input_ids"].shape[1]:]
-    generated_text = tokenizer.decode(
-        generated_ids, skip_special_tokens=True
-    ).strip()
 
-    normalized = generated_text.upper()
+def classify_batch(
+    texts: List[str], use_student: bool = True
+) -> List[Dict[str, object]]:
+    """여러 문장을 SAFE / UNSAFE 로 분류.
 
-    label_keywords = {
-        "safe": ["SAFE", "OK"],
-        "unsafe": ["UNSAFE", "NOT SAFE", "BAD"],
-    }
+    작은 분류기(student)가 있으면 먼저 사용하고, 확신하지 못한 문장만 모아
+    Mistral 로 한 번 더 판별한다.
+    """
+    if not texts:
+        return []
 
-    is_safe: Optional[bool] = None
-    if any(kw in normalized for kw in label_keywords["unsafe"]):
-        is_safe = False
-    elif any(kw in normalized for kw in label_keywords["safe"]):
-        is_safe = True
+    decisions = _classify_with_student(texts) if use_student else [None] * len(texts)
+    uncertain = [i for i, decision in enumerate(decisions) if decision is None]
+    if uncertain:
+        llm_decisions = _classify_with_llm([texts[i] for i in uncertain])
+        for i, decision in zip(uncertain, llm_decisions):
+            decisions[i] = decision
 
-    if is_safe is None:
-        # 애매하면 보수적으로 unsafe 처리
-        is_safe = False
+    return [dict(_RESULTS[bool(is_safe)]) for is_safe in decisions]
 
-    return {
-        "is_safe": is_safe,
-        "raw_decision": generated_text,
-        "normalized_decision": normalized,
-    }
+
+def classify_text(text: str) -> Dict[str, object]:
+    """입력 문장을 SAFE / UNSAFE 로 분류."""
+    return classify_batch([text])[0]
+
+
+def _warmup_shapes(tokenizer: AutoTokenizer) -> List[Tuple[int, int]]:
+    """_encode_batch(bucketed=True) 가 만들 수 있는 모든 (배치, 길이) shape."""
+    prefix, suffix = _prompt_ids(tokenizer)
+    shortest = len(prefix) + len(suffix)
+    longest = max(settings.max_tokens, shortest + 1)
+
+    batch_sizes = [1]
+    while batch_sizes[-1] < settings.batch_max_size:
+        batch_sizes.append(batch_sizes[-1] * 2)
+
+    first = -(-shortest // _SEQ_BUCKET) * _SEQ_BUCKET
+    seq_lens = list(range(first, longest + _SEQ_BUCKET, _SEQ_BUCKET))
+    return [(batch, seq) for batch in batch_sizes for seq in seq_lens]
+
+
+def _raise_recompile_limit(shape_count: int) -> None:
+    """bucket shape 마다 재컴파일되므로 dynamo 재컴파일 한도를 shape 수 이상으로 올린다.
+
+    한도(기본 8)를 넘으면 dynamo 는 예외 없이 경고만 남기고 eager 로 실행하므로,
+    warmup 한 shape 이 조용히 컴파일 없이 처리되지 않게 한다.
+    """
+    config = torch._dynamo.config
+    name = "recompile_limit" if hasattr(config, "recompile_limit") else "cache_size_limit"
+    setattr(config, name, max(getattr(config, name), shape_count))
+
+
+def warmup() -> None:
+    """모델을 로드하고 실행해 컴파일 비용을 첫 요청 전에 치른다.
+
+    컴파일된 모델이면 요청에서 나올 수 있는 모든 bucket shape 을 미리 실행한다.
+    """
+    tokenizer, model = load_model()
+    if _is_compiled(model):
+        device = _get_device()
+        shapes = _warmup_shapes(tokenizer)
+        _raise_recompile_limit(len(shapes))
+        try:
+            for batch_size, seq_len in shapes:
+                input_ids = torch.full(
+                    (batch_size, seq_len), tokenizer.pad_token_id, device=device
+                )
+                _last_logits(
+                    model,
+                    {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)},
+                )
+        except Exception:
+            # torch.compile 이 실패하면 eager 모델로 되돌린다
+            logger.warning("torch.compile warmup failed; using eager model.", exc_info=True)
+            _use_eager_model()
+    _classify_with_llm(["warmup"])
+    _classify_with_student(["warmup"])
@@ -1,65 +1,114 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import logging
+from typing import Annotated, AsyncIterator, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, validator
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
-from ..model import classify_text
+from ..batcher import batcher
 
-router = APIRouter(prefix="/api", tags=["chat"])
+logger = logging.getLogger(__name__)
 
+router = APIRouter(prefix="/api", tags=["chat"])
 
-class Message(BaseModel):
-    role: str = Field(..., description="Message author role, e.g., user or assistant.")
-    content: str = Field(..., description="Message content.")
 
-    @validator("role")
-    def validate_role(cls, value: str) -> str:  # noqa: D417
-        allowed = {"user", "assistant", "system"}
-        if value not in allowed:
-            raise ValueError(f"role must be one of {allowed}")
-        return value
+class Message(msgspec.Struct):
+    role: Annotated[
+        Literal["user", "assistant", "system"],
+        msgspec.Meta(description="Message author role, e.g., user or assistant."),
+    ]
+    content: Annotated[str, msgspec.Meta(description="Message content.")]
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(msgspec.Struct):
     messages: List[Message]
-    max_tokens: Optional[int] = Field(
-        None, ge=1, description="Optional override for token limit (현재는 사용하지 않음)."
-    )
-
-
-class ChatResponse(BaseModel):
-    role: str = Field("assistant", description="Role of the generated message")
+    max_tokens: Optional[
+        Annotated[
+            int,
+            msgspec.Meta(
+                ge=1, description="Optional override for token limit (현재는 사용하지 않음)."
+            ),
+        ]
+    ] = None
+
+
+class ChatResponse(msgspec.Struct, kw_only=True):
+    role: Annotated[str, msgspec.Meta(description="Role of the generated message")] = "assistant"
     content: str
-    is_safe: Optional[bool] = Field(
-        None, description="True if the last user message is considered safe."
-    )
-    raw_decision: Optional[str] = Field(
-        None, description="Raw classifier output text (for debugging)."
-    )
+    is_safe: Annotated[
+        Optional[bool],
+        msgspec.Meta(description="True if the last user message is considered safe."),
+    ] = None
+    raw_decision: Annotated[
+        Optional[str],
+        msgspec.Meta(description="Raw classifier output text (for debugging)."),
+    ] = None
+
+
+_REQUEST_DECODER = msgspec.json.Decoder(ChatRequest)
+_RESPONSE_ENCODER = msgspec.json.Encoder()
+
+
+def _openapi_schema(type_: type) -> Dict[str, object]:
+    """msgspec JSON schema 를 OpenAPI 에 넣을 수 있도록 $ref 를 풀어서 반환."""
+    schema = msgspec.json.schema(type_)
+    defs = schema.pop("$defs", {})
+
+    def resolve(node: object) -> object:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return resolve(defs[ref.rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)  # type: ignore[return-value]
+
+
+# 본문을 msgspec 으로 직접 처리하므로 OpenAPI 스키마는 따로 지정한다
+_CHAT_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _openapi_schema(ChatRequest)}},
+    }
+}
+_CHAT_RESPONSES = {
+    200: {
+        "description": "Classification result (JSON, or SSE when requested).",
+        "content": {
+            "application/json": {"schema": _openapi_schema(ChatResponse)},
+            "text/event-stream": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+# SSE 응답에서 클라이언트 연결 끊김을 확인하고 heartbeat 를 보내는 간격 (초)
+_DISCONNECT_POLL_SECONDS = 0.5
+_SSE_ERROR = msgspec.json.encode({"detail": "Internal Server Error"})
+
+
+async def _decode_chat_request(request: Request) -> ChatRequest:
+    """요청 본문을 pydantic 대신 msgspec 으로 디코딩/검증."""
+    try:
+        return _REQUEST_DECODER.decode(await request.body())
+    except msgspec.DecodeError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
 def _get_last_user_message(messages: List[Message]) -> Message:
     """가장 마지막 user 역할 메시지를 찾는다."""
-    for message in reversed(messages):
-        if message.role == "user":
-            return message
-    raise ValueError("At least one user message is required.")
+    last_user = next((m for m in reversed(messages) if m.role == "user"), None)
+    if last_user is None:
+        raise ValueError("At least one user message is required.")
+    return last_user
 
 
-@router.post("/chat", response_model=ChatResponse)
-def chat(request: ChatRequest) -> ChatResponse:
-    if not request.messages:
-        raise HTTPException(status_code=400, detail="messages must not be empty")
-
-    try:
-        last_user_message = _get_last_user_message(request.messages)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-
-    # 필터 모델로 분류 수행
-    result = classify_text(last_user_message.content)
+def _build_response(result: Dict[str, object]) -> ChatResponse:
     is_safe: bool = bool(result.get("is_safe"))
     raw_decision: str = str(result.get("raw_decision", ""))
 
@@ -73,3 +122,69 @@ def chat(request: ChatRequest) -> ChatResponse:
         is_safe=is_safe,
         raw_decision=raw_decision,
     )
+
+
+async def _event_stream(http_request: Request, text: str) -> AsyncIterator[bytes]:
+    """SSE: 먼저 상태 이벤트를 보내고, 분류가 끝나면 결과 이벤트를 보낸다.
+
+    클라이언트가 연결을 끊으면 대기 중인 분류 요청을 취소해 배치에서 빠지게 한다.
+    """
+    yield b"event: status\ndata: classifying\n\n"
+
+    task = asyncio.ensure_future(batcher.submit(text))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=_DISCONNECT_POLL_SECONDS)
+            if done:
+                break
+            if await http_request.is_disconnected():
+                return
+            yield b": heartbeat\n\n"
+
+        try:
+            response = _build_response(task.result())
+        except Exception:
+            # 내부 오류 내용은 클라이언트에 보내지 않고 서버 로그에만 남긴다
+            logger.exception("Classification failed while streaming /api/chat.")
+            yield b"event: error\ndata: " + _SSE_ERROR + b"\n\n"
+            return
+        yield b"event: result\ndata: " + _RESPONSE_ENCODER.encode(response) + b"\n\n"
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@router.post(
+    "/chat",
+    response_class=Response,
+    responses=_CHAT_RESPONSES,
+    openapi_extra=_CHAT_OPENAPI_EXTRA,
+)
+async def chat(
+    http_request: Request,
+    request: ChatRequest = Depends(_decode_chat_request),
+) -> Response:
+    """마지막 user 메시지를 분류.
+
+    Accept 헤더에 text/event-stream 이 있으면 SSE 로 스트리밍하고, 아니면
+    기존처럼 JSON 하나로 응답한다.
+    """
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="messages must not be empty")
+
+    try:
+        last_user_message = _get_last_user_message(request.messages)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if "text/event-stream" in http_request.headers.get("accept", ""):
+        return StreamingResponse(
+            _event_stream(http_request, last_user_message.content),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    # 필터 모델로 분류 수행 (동시 요청은 배치로 묶임)
+    result = await batcher.submit(last_user_message.content)
+    response = _build_response(result)
+    return Response(_RESPONSE_ENCODER.encode(response), media_type="application/json")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+import torch
+
+
+T = TypeVar("T")
+
+
+def _init_worker() -> None:
+    """추론 스레드 시작 시 torch 스레드 수를 고정한다.
+
+    intra-op 스레드는 OMP_NUM_THREADS (기본: 코어 수 - 1) 로 맞추고,
+    inter-op 병렬화는 쓰지 않으므로 1 로 둔다.
+    """
+    torch.set_num_threads(int(os.environ.get("OMP_NUM_THREADS", os.cpu_count() or 1)))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # inter-op 스레드 풀이 이미 시작되었으면 변경할 수 없다
+        pass
+    # grad 모드는 스레드별 상태이므로 추론 스레드에서 끈다
+    torch.set_grad_enabled(False)
+
+
+# 모델은 이 스레드 하나에서만 실행 (요청 처리 스레드와 GIL 경합 분리)
+INFER_POOL = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="inference",
+    initializer=_init_worker,
+)
+
+
+async def run_inference(fn: Callable[..., T], *args: object) -> T:
+    """fn(*args) 를 추론 워커에서 실행하고 결과를 기다린다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(INFER_POOL, fn, *args)
+
+
+def shutdown() -> None:
+    INFER_POOL.shutdown(wait=False, cancel_futures=True)
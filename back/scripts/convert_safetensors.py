@@ -0,0 +1,104 @@
+"""models/base 와 models/adapter 의 .bin 체크포인트를 safetensors 로 한 번 변환.
+
+safetensors 샤드는 from_pretrained 가 mmap 으로 읽으므로 pickle 역직렬화 없이
+로드되고, 여러 워커의 파일 읽기가 OS 페이지 캐시를 공유한다.
+
+새 샤드는 임시 폴더에 저장하고 다시 로드해 확인한 뒤에만 모델 폴더로 옮긴다
+(config.json 등 기존 파일은 건드리지 않음). --delete-bin 을 주면 확인이 끝난
+뒤 원래의 pytorch_model*.bin* / adapter_model.bin 파일을 삭제한다.
+
+사용법 (back/ 에서):
+    python -m scripts.convert_safetensors [--delete-bin]
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+import torch
+from safetensors.torch import load_file, save_file
+from transformers import AutoModelForCausalLM
+
+from app.config import settings
+
+
+def convert_base(base_dir: Path, delete_bin: bool) -> None:
+    if any(base_dir.glob("*.safetensors")):
+        print(f"{base_dir}: already safetensors, skipping")
+        return
+
+    with tempfile.TemporaryDirectory(dir=base_dir.parent) as tmp:
+        staging = Path(tmp)
+        model = AutoModelForCausalLM.from_pretrained(
+            base_dir,
+            torch_dtype="auto",
+            low_cpu_mem_usage=True,
+        )
+        model.save_pretrained(staging, safe_serialization=True)
+        del model
+
+        # 새 샤드가 실제로 로드되는지 확인한 뒤에만 옮긴다
+        AutoModelForCausalLM.from_pretrained(
+            staging,
+            torch_dtype="auto",
+            low_cpu_mem_usage=True,
+            use_safetensors=True,
+        )
+
+        for path in staging.iterdir():
+            if path.name.endswith(".safetensors") or path.name.endswith(
+                ".safetensors.index.json"
+            ):
+                shutil.move(str(path), base_dir / path.name)
+
+    if delete_bin:
+        for path in base_dir.glob("pytorch_model*.bin*"):
+            path.unlink()
+    print(f"{base_dir}: converted to safetensors")
+
+
+def convert_adapter(adapter_dir: Path, delete_bin: bool) -> None:
+    source = adapter_dir / "adapter_model.bin"
+    target = adapter_dir / "adapter_model.safetensors"
+    if target.exists() or not source.exists():
+        print(f"{adapter_dir}: nothing to convert, skipping")
+        return
+
+    state_dict = torch.load(source, map_location="cpu", weights_only=True)
+    # safetensors 는 메모리를 공유하는 텐서를 저장하지 못하므로 복사
+    tensors = {k: v.contiguous().clone() for k, v in state_dict.items()}
+
+    staging = target.with_name(target.name + ".tmp")
+    save_file(tensors, staging)
+    reloaded = load_file(staging)
+    if reloaded.keys() != tensors.keys() or any(
+        not torch.equal(reloaded[k], v) for k, v in tensors.items()
+    ):
+        staging.unlink()
+        raise RuntimeError(f"{staging}: reloaded tensors do not match {source}")
+    staging.replace(target)
+
+    if delete_bin:
+        source.unlink()
+    print(f"{adapter_dir}: converted to safetensors")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", type=Path, default=Path(settings.base_model_path))
+    parser.add_argument("--adapter", type=Path, default=Path(settings.adapter_path))
+    parser.add_argument(
+        "--delete-bin",
+        action="store_true",
+        help="delete the original .bin files after the new shards load",
+    )
+    args = parser.parse_args()
+
+    convert_base(args.base, args.delete_bin)
+    convert_adapter(args.adapter, args.delete_bin)
+
+
+if __name__ == "__main__":
+    main()
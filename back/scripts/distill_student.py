@@ -0,0 +1,129 @@
+"""Mistral+LoRA 필터의 판단을 작은 SAFE/UNSAFE 분류기로 distill.
+
+1. 입력 문장 파일(한 줄에 한 문장)을 Mistral 로 라벨링
+2. xlm-roberta-base 에 2-class 헤드를 붙여 fine-tune
+3. ONNX 로 export 한 뒤 INT8 동적 양자화하여 models/student 에 저장
+
+서버는 models/student 가 있으면 이 분류기를 먼저 사용하고, 확신도가
+student_confidence_threshold 보다 낮을 때만 Mistral 을 호출한다.
+
+사용법 (back/ 에서):
+    python -m scripts.distill_student messages.txt
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import torch
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import (
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    Trainer,
+    TrainingArguments,
+)
+
+from app.config import settings
+from app.model import classify_batch, load_model
+
+
+LABELS = {0: "UNSAFE", 1: "SAFE"}
+
+
+class _LabeledTexts(torch.utils.data.Dataset):
+    def __init__(self, encodings: Dict[str, List[List[int]]], labels: List[int]) -> None:
+        self.encodings = encodings
+        self.labels = labels
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, index: int) -> Dict[str, torch.Tensor]:
+        item = {key: torch.tensor(values[index]) for key, values in self.encodings.items()}
+        item["labels"] = torch.tensor(self.labels[index])
+        return item
+
+
+def label_with_teacher(texts: List[str], batch_size: int) -> List[int]:
+    """Mistral(teacher) 판단을 0=UNSAFE / 1=SAFE 라벨로 수집."""
+    load_model()
+    labels: List[int] = []
+    for start in range(0, len(texts), batch_size):
+        chunk = texts[start : start + batch_size]
+        results = classify_batch(chunk, use_student=False)
+        labels.extend(int(bool(result["is_safe"])) for result in results)
+    return labels
+
+
+def train_student(
+    texts: List[str], labels: List[int], base: str, output_dir: Path, epochs: int
+) -> None:
+    tokenizer = AutoTokenizer.from_pretrained(base, use_fast=True)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        base,
+        num_labels=len(LABELS),
+        id2label=LABELS,
+        label2id={label: index for index, label in LABELS.items()},
+    )
+
+    encodings = tokenizer(
+        texts, truncation=True, max_length=settings.max_tokens, padding=True
+    )
+    dataset = _LabeledTexts(dict(encodings), labels)
+
+    trainer = Trainer(
+        model=model,
+        args=TrainingArguments(
+            output_dir=str(output_dir / "checkpoints"),
+            num_train_epochs=epochs,
+            per_device_train_batch_size=16,
+            learning_rate=2e-5,
+            save_strategy="no",
+            report_to=[],
+        ),
+        train_dataset=dataset,
+    )
+    trainer.train()
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+
+
+def export_onnx_int8(trained_dir: Path, student_dir: Path) -> None:
+    """ONNX export 후 AVX-512 VNNI 용 동적 INT8(per-channel) 양자화."""
+    onnx_model = ORTModelForSequenceClassification.from_pretrained(trained_dir, export=True)
+    onnx_model.save_pretrained(student_dir)
+    AutoTokenizer.from_pretrained(trained_dir).save_pretrained(student_dir)
+
+    # 다시 실행하면 model_quantized.onnx 도 있으므로 원본 파일을 지정
+    quantizer = ORTQuantizer.from_pretrained(student_dir, file_name="model.onnx")
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+    quantizer.quantize(save_dir=student_dir, quantization_config=qconfig)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("texts", type=Path, help="UTF-8 file with one message per line")
+    parser.add_argument("--base", default="xlm-roberta-base")
+    parser.add_argument("--output", type=Path, default=Path(settings.student_model_path))
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=settings.batch_max_size)
+    args = parser.parse_args()
+
+    lines = args.texts.read_text(encoding="utf-8").splitlines()
+    texts = [line.strip() for line in lines if line.strip()]
+    labels = label_with_teacher(texts, args.batch_size)
+    print(f"labelled {len(texts)} texts ({sum(labels)} SAFE)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trained_dir = Path(tmp)
+        train_student(texts, labels, args.base, trained_dir, args.epochs)
+        export_onnx_int8(trained_dir, args.output)
+    print(f"student classifier written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""LoRA 를 합친 Mistral 필터를 llama.cpp 용 Q4_K_M GGUF 로 변환.
+
+cpu_backend='llama' (또는 'auto' 이고 파일이 있을 때) 서버가 이 파일을
+llama.cpp 로 mmap 하여 실행한다. llama.cpp 체크아웃(빌드된 llama-quantize
+포함)이 필요하다.
+
+사용법 (back/ 에서):
+    python -m scripts.export_gguf --llama-cpp ~/llama.cpp
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from app.config import settings
+from scripts.merge_adapter import save_merged_model
+
+
+def _quantize_binary(llama_cpp: Path) -> Path:
+    for candidate in (
+        llama_cpp / "build" / "bin" / "llama-quantize",
+        llama_cpp / "llama-quantize",
+    ):
+        if candidate.exists():
+            return candidate
+    raise RuntimeError(f"llama-quantize not found under {llama_cpp}; build llama.cpp first.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llama-cpp", type=Path, required=True, help="llama.cpp checkout")
+    parser.add_argument("--output", type=Path, default=Path(settings.gguf_model_path))
+    parser.add_argument("--quant", default="Q4_K_M")
+    args = parser.parse_args()
+
+    quantize = _quantize_binary(args.llama_cpp)
+    with tempfile.TemporaryDirectory() as tmp:
+        merged_dir = save_merged_model(Path(tmp) / "merged")
+        f16_path = Path(tmp) / "model-f16.gguf"
+        subprocess.run(
+            [
+                sys.executable,
+                str(args.llama_cpp / "convert_hf_to_gguf.py"),
+                str(merged_dir),
+                "--outtype",
+                "f16",
+                "--outfile",
+                str(f16_path),
+            ],
+            check=True,
+        )
+        subprocess.run([str(quantize), str(f16_path), str(args.output), args.quant], check=True)
+    print(f"GGUF model written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""LoRA 를 합친 Mistral 필터를 ONNX 로 export 하고 INT8 weight 양자화.
+
+cpu_backend='onnx' 일 때 서버가 이 모델을 ONNX Runtime CPU EP 로 실행한다.
+분류에는 다음 토큰 logits 한 번만 필요하므로 KV 캐시 없이(use_cache=False)
+export 한다.
+
+사용법 (back/ 에서):
+    python -m scripts.export_onnx
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+from app.config import settings
+from scripts.merge_adapter import save_merged_model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=Path(settings.onnx_model_path))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        merged_dir = save_merged_model(Path(tmp))
+        model = ORTModelForCausalLM.from_pretrained(
+            merged_dir, export=True, use_cache=False
+        )
+        model.save_pretrained(args.output)
+        AutoTokenizer.from_pretrained(merged_dir).save_pretrained(args.output)
+
+    # oneDNN AVX-512 VNNI int8 GEMM 용 동적(weight-only) per-channel 양자화
+    # 다시 실행하면 model_quantized.onnx 도 있으므로 원본 파일을 지정
+    quantizer = ORTQuantizer.from_pretrained(args.output, file_name="model.onnx")
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+    # 7B 가중치는 2GB protobuf 한계를 넘으므로 external data 형식으로 저장
+    quantizer.quantize(
+        save_dir=args.output,
+        quantization_config=qconfig,
+        use_external_data_format=True,
+    )
+    print(f"ONNX model written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""models/base 에 LoRA 어댑터를 합친 전체 정밀도 체크포인트를 저장.
+
+ONNX / GGUF export 의 입력으로 사용된다.
+
+사용법 (back/ 에서):
+    python -m scripts.merge_adapter OUTPUT_DIR
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from peft import PeftModel
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from app.config import settings
+
+
+def save_merged_model(output_dir: Path) -> Path:
+    base_dir = Path(settings.base_model_path)
+    adapter_dir = Path(settings.adapter_path)
+
+    model = AutoModelForCausalLM.from_pretrained(
+        base_dir,
+        torch_dtype="auto",
+        low_cpu_mem_usage=True,
+    )
+    if adapter_dir.exists():
+        model = PeftModel.from_pretrained(model, adapter_dir).merge_and_unload()
+
+    model.save_pretrained(output_dir, safe_serialization=True)
+    AutoTokenizer.from_pretrained(base_dir).save_pretrained(output_dir)
+    return output_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    args = parser.parse_args()
+
+    save_merged_model(args.output)
+    print(f"merged model written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()